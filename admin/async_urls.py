@@ -0,0 +1,29 @@
+from django.urls import path
+from . import views, async_views
+
+# Same routes as urls.py, with the upstream-proxy endpoints served by the
+# async views. Used by the ASGI profile (adminservice.settings_asgi).
+urlpatterns = [
+    # User Management
+    path('users/', async_views.view_all_users, name='view_all_users'),
+    path('users/<str:role>/<int:user_id>/block/', async_views.block_user, name='block_user'),
+    path('users/<str:role>/<int:user_id>/unblock/', async_views.unblock_user, name='unblock_user'),
+    path('users/verify/', views.verify_user, name='verify_user'),
+
+    # Payment Disputes
+    path('disputes/', views.payment_disputes, name='payment_disputes'),
+    path('disputes/<int:dispute_id>/', views.get_dispute_details, name='get_dispute_details'),
+    path('disputes/<int:dispute_id>/resolve/', views.resolve_dispute, name='resolve_dispute'),
+    path('disputes/import/', views.import_disputes, name='import_disputes'),
+    path('disputes/events/', async_views.dispute_events, name='dispute_events'),
+
+    # Reviews
+    path('reviews/<int:review_id>/delete/', async_views.delete_review, name='delete_review'),
+
+    # Notifications
+    path('notifications/send/', async_views.send_notification, name='send_notification'),
+    path('notifications/', async_views.view_all_notifications, name='view_all_notifications'),
+
+    # Audit Logs
+    path('logs/', views.admin_logs, name='admin_logs'),
+]
@@ -0,0 +1,317 @@
+import asyncio
+import json
+from functools import wraps
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from .events import alog_admin_action, astream_events, latest_log_id, resume_event_id
+from .permissions import IsAdminUser
+from .services import get_user_projection_params, aread_user_page
+
+
+# One pooled client per worker process, created on first use inside the
+# server's event loop.
+_http_client = None
+
+
+def get_http_client():
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.UPSTREAM_TIMEOUT, pool=settings.UPSTREAM_POOL_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+    return _http_client
+
+
+def forward_headers(request):
+    # requests drops None header values, httpx rejects them.
+    token = request.headers.get("Authorization")
+    return {"Authorization": token} if token else {}
+
+
+def request_data(request):
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            return {}
+    return request.POST
+
+
+def authenticate(request):
+    # Same authenticators as the DRF views (DEFAULT_AUTHENTICATION_CLASSES).
+    for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        user_auth = authenticator().authenticate(request)
+        if user_auth is not None:
+            return user_auth
+    return None
+
+
+def unauthorized(detail):
+    response = JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+    authenticators = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    if authenticators:
+        response["WWW-Authenticate"] = authenticators[0]().authenticate_header(request=None)
+    return response
+
+
+def async_admin_view(methods):
+    """
+    Async counterpart of ``@api_view`` + ``IsAuthenticated, IsAdminUser``.
+
+    DRF views cannot be coroutines, so the method check, DRF's configured
+    authentication and the admin permission are applied here and the view
+    returns a JsonResponse.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return JsonResponse(
+                    {"detail": f'Method "{request.method}" not allowed.'},
+                    status=status.HTTP_405_METHOD_NOT_ALLOWED
+                )
+
+            try:
+                user_auth = await sync_to_async(authenticate)(request)
+            except AuthenticationFailed as exc:
+                return unauthorized(exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail})
+
+            if user_auth is None:
+                return unauthorized({"detail": "Authentication credentials were not provided."})
+
+            request.user, request.auth = user_auth
+            if not IsAdminUser().has_permission(request, None):
+                return JsonResponse(
+                    {"detail": "You do not have permission to perform this action."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            return await view(request, *args, **kwargs)
+
+        return csrf_exempt(wrapper)
+
+    return decorator
+
+
+async def fetch_user_page(url, headers, search_query, start, end):
+    async with get_http_client().stream(
+        "GET", url, headers=headers, params=get_user_projection_params()
+    ) as response:
+        if response.status_code != 200:
+            return None
+        return await aread_user_page(response, search_query, start, end)
+
+
+@async_admin_view(["GET"])
+async def view_all_users(request):
+    headers = forward_headers(request)
+    search_query = request.GET.get('search', '')
+    page = request.GET.get('page', 1)
+    page_size = request.GET.get('page_size', 20)
+
+    try:
+        page = int(page)
+        page_size = int(page_size)
+    except (ValueError, TypeError):
+        page = 1
+        page_size = 20
+
+    start = (page - 1) * page_size
+    end = start + page_size
+
+    try:
+        clients, freelancers = await asyncio.gather(
+            fetch_user_page(
+                f"{settings.CLIENT_SERVICE_URL}/api/clients/",
+                headers, search_query, start, end
+            ),
+            fetch_user_page(
+                f"{settings.FREELANCER_SERVICE_URL}/api/freelancers/",
+                headers, search_query, start, end
+            ),
+        )
+    except httpx.HTTPError:
+        return JsonResponse(
+            {"error": "User services unavailable"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    except ValueError:
+        clients = freelancers = None
+
+    if clients is None or freelancers is None:
+        return JsonResponse(
+            {"error": "Failed to fetch users"},
+            status=status.HTTP_502_BAD_GATEWAY
+        )
+
+    return JsonResponse(
+        {
+            "clients": clients,
+            "freelancers": freelancers,
+            "page": page,
+            "page_size": page_size
+        },
+        status=status.HTTP_200_OK
+    )
+
+
+async def toggle_user_block(request, role, user_id, action):
+    if role not in ["client", "freelancer"]:
+        return JsonResponse(
+            {"error": "Invalid role. Must be 'client' or 'freelancer'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    headers = forward_headers(request)
+    service_url = (
+        f"{settings.CLIENT_SERVICE_URL}/api/clients/{user_id}/{action}/"
+        if role == "client"
+        else f"{settings.FREELANCER_SERVICE_URL}/api/freelancers/{user_id}/{action}/"
+    )
+
+    try:
+        response = await get_http_client().patch(service_url, headers=headers)
+    except httpx.HTTPError:
+        return JsonResponse(
+            {"error": "User service unavailable"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    if response.status_code == 200:
+        await alog_admin_action(
+            request.user.id,
+            f"{action.upper()}_USER",
+            "user",
+            user_id,
+            f"{role} {action}ed"
+        )
+        return JsonResponse({"message": f"User {action}ed"}, status=200)
+
+    return JsonResponse({"error": f"Failed to {action} user"}, status=400)
+
+
+@async_admin_view(["PATCH"])
+async def block_user(request, role, user_id):
+    return await toggle_user_block(request, role, user_id, "block")
+
+
+@async_admin_view(["PATCH"])
+async def unblock_user(request, role, user_id):
+    return await toggle_user_block(request, role, user_id, "unblock")
+
+
+@async_admin_view(["DELETE"])
+async def delete_review(request, review_id):
+    headers = forward_headers(request)
+    try:
+        response = await get_http_client().delete(
+            f"{settings.REVIEW_SERVICE_URL}/api/reviews/delete/{review_id}",
+            headers=headers
+        )
+    except httpx.HTTPError:
+        return JsonResponse(
+            {"error": "Review service unavailable"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    if response.status_code == 200:
+        await alog_admin_action(
+            request.user.id,
+            "DELETE_REVIEW",
+            "review",
+            review_id,
+            "Review deleted by admin"
+        )
+        return JsonResponse({"message": "Review deleted"}, status=200)
+
+    return JsonResponse({"error": "Failed to delete review"}, status=400)
+
+
+@async_admin_view(["POST"])
+async def send_notification(request):
+    data = request_data(request)
+    user_id = data.get("user_id")
+    notif_type = data.get("type")
+    message = data.get("message")
+
+    if not all([user_id, notif_type, message]):
+        return JsonResponse(
+            {"error": "user_id, type, and message are required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    payload = {
+        "user_id": user_id,
+        "type": notif_type,
+        "message": message
+    }
+    headers = forward_headers(request)
+    try:
+        response = await get_http_client().post(
+            f"{settings.NOTIFICATION_SERVICE_URL}/api/notifications/send/",
+            json=payload,
+            headers=headers
+        )
+    except httpx.HTTPError:
+        return JsonResponse(
+            {"error": "Notification service unavailable"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    if response.status_code == 201:
+        await alog_admin_action(
+            request.user.id,
+            "SEND_NOTIFICATION",
+            "user",
+            user_id,
+            f"Type: {notif_type}, Message: {message[:50]}"
+        )
+        return JsonResponse({"message": "Notification sent"}, status=200)
+
+    return JsonResponse({"error": "Notification failed"}, status=502)
+
+
+@async_admin_view(["GET"])
+async def view_all_notifications(request):
+    headers = forward_headers(request)
+    try:
+        response = await get_http_client().get(
+            f"{settings.NOTIFICATION_SERVICE_URL}/api/notifications/view",
+            headers=headers
+        )
+    except httpx.HTTPError:
+        return JsonResponse(
+            {"error": "Notification service unavailable"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    return JsonResponse(response.json(), status=response.status_code, safe=False)
+
+
+@async_admin_view(["GET"])
+async def dispute_events(request):
+    try:
+        last_id = resume_event_id(request)
+    except ValueError:
+        return JsonResponse(
+            {"error": "last_id must be an integer"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if last_id is None:
+        last_id = await sync_to_async(latest_log_id)()
+
+    response = StreamingHttpResponse(astream_events(last_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connection, transaction
+from .models import AdminActionLog
+
+
+REPLAY_BATCH_SIZE = 500
+# Ids below the poller's cursor that are read again on every poll.
+POLL_LOOKBACK = 100
+
+DISPUTE_EVENTS = {
+    "PAYMENT_DISPUTE_CREATED": "dispute.created",
+    "DISPUTE_RESOLVED": "dispute.resolved",
+    "PAYMENT_DISPUTES_IMPORTED": "dispute.imported",
+}
+
+
+def event_name(action_type):
+    return DISPUTE_EVENTS.get(action_type, "admin_action")
+
+
+def log_data(log):
+    return {
+        "id": log.id,
+        "admin_id": log.admin_id,
+        "action": log.action_type,
+        "target": log.target_type,
+        "target_id": log.target_id,
+        "description": log.description,
+        "time": log.created_at
+    }
+
+
+def log_event(log, dispute=None):
+    data = log_data(log)
+    if dispute is not None:
+        data["dispute"] = dispute
+    return {"id": log.id, "event": event_name(log.action_type), "data": data}
+
+
+class EventBroker:
+    """
+    In-process pub/sub for admin events.
+
+    Every published event gets a broker sequence number; subscribers follow
+    that sequence rather than log ids, because rows committed by other
+    workers reach the broker later than (and out of id order with) local
+    ones. Events are de-duplicated by their ``AdminActionLog`` id. Sync
+    (WSGI thread) and async (ASGI) subscribers are both supported.
+    """
+
+    def __init__(self, history=1000):
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=history)
+        self._ids = set()
+        self._seq = 0
+        self._async_waiters = set()
+        self.subscribers = 0
+
+    def subscribe(self):
+        with self._cond:
+            self.subscribers += 1
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def cursor(self):
+        with self._cond:
+            return self._seq
+
+    def publish(self, event):
+        with self._cond:
+            if event["id"] in self._ids:
+                return
+            if len(self._events) == self._events.maxlen:
+                self._ids.discard(self._events[0][1]["id"])
+            self._seq += 1
+            self._events.append((self._seq, event))
+            self._ids.add(event["id"])
+            self._cond.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, flag in waiters:
+            loop.call_soon_threadsafe(flag.set)
+
+    def since(self, cursor):
+        """
+        Return ``(cursor, events)`` published after ``cursor``. ``events`` is
+        None if some of them already dropped out of the history.
+        """
+        with self._cond:
+            if self._events and self._events[0][0] > cursor + 1:
+                return self._seq, None
+            return self._seq, [event for seq, event in self._events if seq > cursor]
+
+    def extras(self, ids):
+        # Payload attached at publish time (e.g. the dispute) for logs that
+        # are still in the in-memory history.
+        with self._cond:
+            return {event["id"]: event for _, event in self._events if event["id"] in ids}
+
+    def wait(self, cursor, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > cursor, timeout)
+        return self.since(cursor)
+
+    async def wait_async(self, cursor, timeout):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            self._async_waiters.add(waiter)
+        try:
+            cursor, events = self.since(cursor)
+            if events == []:
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                cursor, events = self.since(cursor)
+            return cursor, events
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+
+
+def latest_log_id():
+    return AdminActionLog.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+
+def heartbeat_interval():
+    return getattr(settings, "ADMIN_EVENT_STREAM_HEARTBEAT", 15)
+
+
+class LogPoller:
+    """
+    Copies audit log rows written by other worker processes into the broker.
+
+    One daemon thread per process, running only while the broker has
+    subscribers, reads new rows every ``heartbeat_interval()`` seconds, so
+    idle streams cost one query per interval in total instead of one each.
+    Rows that commit late are picked up as long as they are within
+    ``POLL_LOOKBACK`` ids of the newest row read.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.cursor = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            # Read before the caller's replay query, so the two overlap
+            # instead of leaving a gap.
+            self.cursor = latest_log_id()
+            self._thread = threading.Thread(target=self.run, name="admin-log-poller", daemon=True)
+            self._thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(heartbeat_interval())
+            with self._lock:
+                if not self.broker.subscribers:
+                    self._thread = None
+                    return
+            try:
+                while self.poll() == REPLAY_BATCH_SIZE:
+                    pass
+            except DatabaseError:
+                pass
+            finally:
+                connection.close()
+
+    def poll(self):
+        # A row whose transaction commits after a higher id was already read
+        # lands below the cursor, so a trailing window is read again; the
+        # broker drops the ids it has already published.
+        logs = list(
+            AdminActionLog.objects.filter(id__gt=self.cursor - POLL_LOOKBACK).order_by("id")[:REPLAY_BATCH_SIZE]
+        )
+        for log in logs:
+            self.broker.publish(log_event(log))
+        if logs:
+            self.cursor = max(self.cursor, logs[-1].id)
+        return len(logs)
+
+
+broker = EventBroker()
+poller = LogPoller(broker)
+
+
+def publish_log(log, dispute=None):
+    broker.publish(log_event(log, dispute))
+
+
+def log_admin_action(admin_id, action, target_type, target_id, description="", dispute=None):
+    log = AdminActionLog.objects.create(
+        admin_id=admin_id,
+        action_type=action,
+        target_type=target_type,
+        target_id=target_id,
+        description=description
+    )
+    # Only committed actions reach the event streams.
+    transaction.on_commit(lambda: publish_log(log, dispute))
+    return log
+
+
+async def alog_admin_action(*args, **kwargs):
+    return await sync_to_async(log_admin_action)(*args, **kwargs)
+
+
+def resume_event_id(request):
+    """Resume token sent by EventSource (``Last-Event-ID``) or ``?last_id=``."""
+    last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_id")
+    if last_id is None:
+        return None
+    return int(last_id)
+
+
+def logged_events(last_id):
+    """
+    Read a batch of events after ``last_id`` from the audit log, oldest first.
+
+    A resume cannot tell which ids below ``last_id`` the client has seen, so
+    a row that commits after a higher id was sent is not replayed.
+    """
+    logs = list(AdminActionLog.objects.filter(id__gt=last_id).order_by("id")[:REPLAY_BATCH_SIZE])
+    extras = broker.extras({log.id for log in logs})
+    return [extras.get(log.id) or log_event(log) for log in logs]
+
+
+def format_event(event):
+    data = json.dumps(event["data"], cls=DjangoJSONEncoder)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
+
+
+class SentEvents:
+    """
+    Ids a stream has sent, so a live event that was also replayed from the
+    database is skipped. Only recent ids are kept: a live event can only
+    repeat one of the last rows of a replay.
+    """
+
+    def __init__(self, last_id, size=1000):
+        self.last_id = last_id
+        self.ids = deque(maxlen=size)
+        self.lookup = set()
+
+    def fresh(self, events):
+        for event in events:
+            if event["id"] in self.lookup:
+                continue
+            if len(self.ids) == self.ids.maxlen:
+                self.lookup.discard(self.ids[0])
+            self.ids.append(event["id"])
+            self.lookup.add(event["id"])
+            self.last_id = max(self.last_id, event["id"])
+            yield event
+
+
+def stream_events(last_id):
+    """
+    Server-sent events for every admin action after ``last_id``.
+
+    Events after ``last_id`` are replayed from the audit log, then live
+    events come from the in-process broker, fed by local writes and by the
+    shared ``LogPoller`` for other workers. Idle heartbeats are a plain
+    comment and do not touch the database.
+    """
+    broker.subscribe()
+    try:
+        cursor = broker.cursor()
+        poller.start()
+        sent = SentEvents(last_id)
+        events = None
+        while True:
+            if events is None:
+                # Replay from the database: on connect, and if the stream
+                # fell behind the broker history.
+                batch = logged_events(sent.last_id)
+                while batch:
+                    for event in sent.fresh(batch):
+                        yield format_event(event)
+                    batch = logged_events(sent.last_id) if len(batch) >= REPLAY_BATCH_SIZE else []
+
+            cursor, events = broker.wait(cursor, heartbeat_interval())
+            if events == []:
+                yield ": ping\n\n"
+            for event in sent.fresh(events or []):
+                yield format_event(event)
+    finally:
+        broker.unsubscribe()
+
+
+async def astream_events(last_id):
+    """Async variant of ``stream_events`` for the ASGI profile."""
+    alogged_events = sync_to_async(logged_events)
+    broker.subscribe()
+    try:
+        cursor = broker.cursor()
+        await sync_to_async(poller.start)()
+        sent = SentEvents(last_id)
+        events = None
+        while True:
+            if events is None:
+                batch = await alogged_events(sent.last_id)
+                while batch:
+                    for event in sent.fresh(batch):
+                        yield format_event(event)
+                    batch = await alogged_events(sent.last_id) if len(batch) >= REPLAY_BATCH_SIZE else []
+
+            cursor, events = await broker.wait_async(cursor, heartbeat_interval())
+            if events == []:
+                yield ": ping\n\n"
+            for event in sent.fresh(events or []):
+                yield format_event(event)
+    finally:
+        broker.unsubscribe()
@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin.imports import DEFAULT_BATCH_SIZE, IMPORT_FORMATS, DisputeImport, decode_lines, guess_format, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Import a nightly payment dispute feed (CSV or NDJSON)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file with one dispute per row")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--admin-id", type=int, default=0, help="Admin recorded in the audit log")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or guess_format(options["path"])
+        try:
+            # Decoded line by line, like uploads, so an encoding error only
+            # stops the import at the offending row.
+            feed = open(options["path"], "rb")
+        except OSError as exc:
+            raise CommandError(f"Cannot open {options['path']}: {exc}")
+
+        with feed:
+            report = DisputeImport(options["admin_id"], batch_size=options["batch_size"]).run(
+                iter_rows(decode_lines(feed), fmt)
+            )
+
+        for rejected in report["rejected"]:
+            self.stderr.write(f"row {rejected['row']}: {json.dumps(rejected['errors'])}")
+
+        summary = self.style.ERROR if report["error"] else self.style.SUCCESS
+        self.stdout.write(summary(
+            f"Processed {report['processed']} rows in {report['seconds']}s "
+            f"({report['rows_per_second']} rows/s): {report['created']} created, "
+            f"{report['duplicates']} duplicates, {report['rejected_count']} rejected, "
+            f"{report['batches']} batches"
+        ))
+        if report["error"]:
+            raise CommandError(f"Import stopped: {report['error']}")
@@ -50,6 +50,12 @@ class PaymentDispute(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Duplicate check for bulk dispute imports.
+            models.Index(fields=["payment_id", "application_id"]),
+        ]
+
     def __str__(self):
         return f"Dispute {self.id} - {self.status}"
 
@@ -0,0 +1,190 @@
+import codecs
+import json
+
+from django.conf import settings
+
+
+DEFAULT_USER_FIELDS = ("id", "name", "email", "status")
+# Fields ``?search=`` matches against (see ``user_matches``).
+SEARCH_FIELDS = ("name", "email")
+
+
+def get_user_fields():
+    return tuple(getattr(settings, "ADMIN_USER_FIELDS", DEFAULT_USER_FIELDS))
+
+
+def get_user_projection_params():
+    # Upstream services that understand the projection param only send back
+    # the listed fields; the others ignore it and we strip fields locally.
+    param = getattr(settings, "ADMIN_USER_FIELDS_PARAM", "fields")
+    if not param:
+        return {}
+    # Search runs before the local projection, so its fields are always
+    # requested even when ADMIN_USER_FIELDS leaves them out.
+    fields = get_user_fields()
+    fields += tuple(field for field in SEARCH_FIELDS if field not in fields)
+    return {param: ",".join(fields)}
+
+
+class UserRecord:
+    """
+    Projected upstream user. Values are kept in one tuple slot, so upstream
+    field names never become attribute names.
+    """
+
+    __slots__ = ("fields", "values")
+
+    def __init__(self, fields, values):
+        self.fields = fields
+        self.values = values
+
+    def to_dict(self):
+        return dict(zip(self.fields, self.values))
+
+
+def project_user(item, fields):
+    return UserRecord(fields, tuple(item.get(field) for field in fields))
+
+
+def user_matches(item, search_query):
+    search_query = search_query.lower()
+    return any(search_query in str(item.get(field, "")).lower() for field in SEARCH_FIELDS)
+
+
+class JsonArrayParser:
+    """
+    Incrementally decode the elements of a top-level JSON array from byte
+    chunks, so the full array is never held in memory.
+
+    If the payload is not an array, the whole document is decoded once the
+    last chunk is fed and stored on ``payload``.
+    """
+
+    whitespace = " \t\n\r"
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.is_array = None
+        self.done = False
+        self.payload = None
+
+    def skip(self, chars):
+        while self.pos < len(self.buf) and self.buf[self.pos] in chars:
+            self.pos += 1
+
+    def incomplete(self, value, end):
+        # A value cut at a chunk boundary can decode too early: "12" of
+        # "123", or "1" of "1.5" / "1e3" where the number stops right
+        # before the "." or exponent. Wait for more input in both cases.
+        if end == len(self.buf):
+            return True
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        return is_number and self.buf[end] in ".eE+-"
+
+    def feed(self, chunk, final=False):
+        self.buf = self.buf[self.pos:] + self.utf8.decode(chunk, final=final)
+        self.pos = 0
+        values = []
+
+        if self.is_array is None:
+            self.skip(self.whitespace)
+            if self.pos >= len(self.buf):
+                if final:
+                    raise ValueError("Empty JSON document")
+                return values
+            self.is_array = self.buf[self.pos] == "["
+            if self.is_array:
+                self.pos += 1
+
+        if not self.is_array:
+            if final:
+                self.payload = json.loads(self.buf[self.pos:])
+                self.done = True
+            return values
+
+        while not self.done:
+            self.skip(self.whitespace + ",")
+            if self.pos >= len(self.buf):
+                if final:
+                    raise ValueError("Unterminated JSON array")
+                break
+            if self.buf[self.pos] == "]":
+                self.done = True
+                break
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            if not final and self.incomplete(value, end):
+                break
+            self.pos = end
+            values.append(value)
+
+        return values
+
+
+class UserPage:
+    """Collects the ``[start:end]`` slice of matching users as slot records."""
+
+    def __init__(self, search_query="", start=0, end=None):
+        self.fields = get_user_fields()
+        self.search_query = search_query
+        self.start = start
+        self.end = end
+        self.index = 0
+        self.records = []
+
+    @property
+    def full(self):
+        return self.end is not None and self.index >= self.end
+
+    def extend(self, items):
+        for item in items:
+            if self.full:
+                break
+            if not isinstance(item, dict):
+                continue
+            if self.search_query and not user_matches(item, self.search_query):
+                continue
+            if self.index >= self.start:
+                self.records.append(project_user(item, self.fields))
+            self.index += 1
+        return self.full
+
+    def result(self, payload=None):
+        if payload is not None:
+            return payload
+        return [record.to_dict() for record in self.records]
+
+
+def read_user_page(response, search_query="", start=0, end=None):
+    """
+    Stream an upstream user listing (``requests`` response opened with
+    ``stream=True``) and return only the requested page as plain dicts
+    restricted to ``ADMIN_USER_FIELDS``. Non-list payloads are returned as-is.
+    """
+    parser = JsonArrayParser()
+    page = UserPage(search_query, start, end)
+    for chunk in response.iter_content(chunk_size=8192):
+        if page.extend(parser.feed(chunk)) or parser.done:
+            break
+    else:
+        page.extend(parser.feed(b"", final=True))
+    return page.result(parser.payload)
+
+
+async def aread_user_page(response, search_query="", start=0, end=None):
+    """Async variant of ``read_user_page`` for streamed ``httpx`` responses."""
+    parser = JsonArrayParser()
+    page = UserPage(search_query, start, end)
+    async for chunk in response.aiter_bytes(chunk_size=8192):
+        if page.extend(parser.feed(chunk)) or parser.done:
+            break
+    else:
+        page.extend(parser.feed(b"", final=True))
+    return page.result(parser.payload)
@@ -1,3 +1,520 @@
-from django.test import TestCase
+import asyncio
+import json
+import random
+import tempfile
+import threading
+from io import BytesIO, StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import requests
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import async_views, events, views
+from .imports import DisputeImport, decode_lines, iter_rows
+from .models import AdminActionLog, PaymentDispute
+from .services import JsonArrayParser, UserPage, get_user_projection_params, project_user
+
+
+STATELESS_JWT = {
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication",
+    )
+}
+
+
+def bearer(role="admin", user_id=7):
+    token = AccessToken()
+    token["user_id"] = user_id
+    token["role"] = role
+    return {"Authorization": f"Bearer {token}"}
+
+
+def mock_upstream(handler):
+    return mock.patch.object(
+        async_views, "_http_client",
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+
+@override_settings(ROOT_URLCONF="adminservice.urls_asgi", REST_FRAMEWORK=STATELESS_JWT)
+class AsyncAdminViewTests(TestCase):
+    async def test_missing_token_is_401(self):
+        response = await self.async_client.patch("/api/users/client/3/block/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "Authentication credentials were not provided."})
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+    async def test_invalid_token_is_401(self):
+        response = await self.async_client.patch(
+            "/api/users/client/3/block/", headers={"Authorization": "Bearer not-a-jwt"}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+
+    async def test_non_admin_is_403(self):
+        response = await self.async_client.patch(
+            "/api/users/client/3/block/", headers=bearer(role="client")
+        )
+        self.assertEqual(response.status_code, 403)
+
+    async def test_wrong_method_is_405(self):
+        response = await self.async_client.get("/api/users/client/3/block/", headers=bearer())
+        self.assertEqual(response.status_code, 405)
+
+    async def test_block_user_calls_upstream_and_logs(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={})
+
+        headers = bearer()
+        with mock_upstream(handler):
+            response = await self.async_client.patch("/api/users/client/3/block/", headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"message": "User blocked"})
+        self.assertEqual(seen[0].method, "PATCH")
+        self.assertEqual(seen[0].url.path, "/api/clients/3/block/")
+        self.assertEqual(seen[0].headers["Authorization"], headers["Authorization"])
+        log = await AdminActionLog.objects.aget()
+        self.assertEqual((log.admin_id, log.action_type, log.target_id), (7, "BLOCK_USER", 3))
+
+    async def test_upstream_unavailable_is_503(self):
+        def handler(request):
+            raise httpx.ConnectError("down", request=request)
+
+        with mock_upstream(handler):
+            response = await self.async_client.delete("/api/reviews/4/delete/", headers=bearer())
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(await AdminActionLog.objects.aexists())
+
+    async def test_view_all_users_returns_projected_page(self):
+        users = [{"id": i, "name": f"user{i}", "email": f"u{i}@x.io", "bio": "x"} for i in range(30)]
+
+        def handler(request):
+            self.assertEqual(request.url.params["fields"], "id,name,email,status")
+            return httpx.Response(200, json=users)
+
+        with mock_upstream(handler):
+            response = await self.async_client.get("/api/users/?page=2&page_size=5", headers=bearer())
+
+        self.assertEqual(response.status_code, 200)
+        clients = response.json()["clients"]
+        self.assertEqual([u["id"] for u in clients], [5, 6, 7, 8, 9])
+        self.assertEqual(set(clients[0]), {"id", "name", "email", "status"})
+
+
+class HttpClientTests(SimpleTestCase):
+    @override_settings(
+        UPSTREAM_TIMEOUT=2, UPSTREAM_POOL_TIMEOUT=20,
+        UPSTREAM_MAX_CONNECTIONS=300, UPSTREAM_MAX_KEEPALIVE_CONNECTIONS=50
+    )
+    def test_pool_limits_and_timeouts_come_from_settings(self):
+        with mock.patch.object(async_views, "_http_client", None), \
+                mock.patch.object(async_views.httpx, "AsyncClient") as client:
+            async_views.get_http_client()
+
+        kwargs = client.call_args.kwargs
+        self.assertEqual(kwargs["timeout"], httpx.Timeout(2, pool=20))
+        self.assertEqual(kwargs["limits"], httpx.Limits(max_connections=300, max_keepalive_connections=50))
+
+
+def parse_chunks(payload, sizes):
+    parser = JsonArrayParser()
+    values = []
+    pos = 0
+    for size in sizes:
+        values += parser.feed(payload[pos:pos + size])
+        pos += size
+    values += parser.feed(payload[pos:], final=True)
+    return values if parser.is_array else parser.payload
+
+
+class JsonArrayParserTests(SimpleTestCase):
+    documents = [
+        [1.5, -2e10, 3E-4, 0.25e+3, 10, -0.0, 123456789, 7e-1],
+        [{"id": 1, "score": 12.75}, {"id": 22, "score": -1e3}, {"id": 333, "name": "na\u00efve \"q\""}],
+        [True, False, None, "caf\u00e9 \u2603", [1, [2.5, []]], {}],
+        [{"name": "\u00e9\u00e8", "tags": ["a", "b"], "n": 1.0e1}],
+        [],
+        {"detail": "not a list", "count": 4.5},
+    ]
+
+    def test_every_two_chunk_split(self):
+        for document in self.documents:
+            payload = json.dumps(document, ensure_ascii=False).encode()
+            for cut in range(len(payload) + 1):
+                with self.subTest(document=document, cut=cut):
+                    self.assertEqual(parse_chunks(payload, [cut]), document)
+
+    def test_random_chunking(self):
+        rng = random.Random(26)
+        for document in self.documents:
+            payload = json.dumps(document, ensure_ascii=False, indent=rng.choice([None, 1])).encode()
+            for _ in range(200):
+                sizes = [rng.randint(0, 4) for _ in range(len(payload))]
+                with self.subTest(document=document, sizes=sizes):
+                    self.assertEqual(parse_chunks(payload, sizes), document)
+
+    def test_number_cut_before_fraction_or_exponent_waits(self):
+        parser = JsonArrayParser()
+        self.assertEqual(parser.feed(b"[1, 2"), [1])
+        self.assertEqual(parser.feed(b"."), [])
+        self.assertEqual(parser.feed(b"5e"), [])
+        self.assertEqual(parser.feed(b"-1, 3]"), [0.25, 3])
+        self.assertTrue(parser.done)
+
+    def test_truncated_array_raises(self):
+        with self.assertRaises(ValueError):
+            parse_chunks(b"[1, 2.", [3])
+
+
+class ProjectUserTests(SimpleTestCase):
+    def test_arbitrary_field_names(self):
+        fields = ("first-name", "to_dict", "__dict__", "fields", "id")
+        item = {"first-name": "Ada", "to_dict": 1, "__dict__": 2, "fields": 3, "id": 4, "bio": "x"}
+        record = project_user(item, fields)
+        self.assertEqual(record.to_dict(), {field: item[field] for field in fields})
+
+    def test_missing_fields_are_none(self):
+        self.assertEqual(project_user({"id": 1}, ("id", "email")).to_dict(), {"id": 1, "email": None})
+
+
+class UserProjectionParamsTests(SimpleTestCase):
+    def test_configured_fields_are_sent(self):
+        self.assertEqual(get_user_projection_params(), {"fields": "id,name,email,status"})
+
+    @override_settings(ADMIN_USER_FIELDS=("id", "status"))
+    def test_search_fields_are_always_requested(self):
+        self.assertEqual(get_user_projection_params(), {"fields": "id,status,name,email"})
+
+    @override_settings(ADMIN_USER_FIELDS=("id", "status"))
+    def test_search_works_without_search_fields_in_output(self):
+        page = UserPage(search_query="ada", start=0, end=10)
+        page.extend([{"id": 1, "name": "Ada", "status": "active"}, {"id": 2, "name": "Bob"}])
+        self.assertEqual(page.result(), [{"id": 1, "status": "active"}])
+
+    @override_settings(ADMIN_USER_FIELDS_PARAM="")
+    def test_projection_param_can_be_disabled(self):
+        self.assertEqual(get_user_projection_params(), {})
+
+
+class ViewAllUsersTests(SimpleTestCase):
+    def test_first_response_closed_when_second_request_fails(self):
+        client_res = mock.MagicMock()
+        client_res.__enter__.return_value = client_res
+        request = APIRequestFactory().get("/api/users/")
+        force_authenticate(request, user=SimpleNamespace(role="admin", is_authenticated=True))
+
+        with mock.patch.object(
+            views.requests, "get", side_effect=[client_res, requests.exceptions.ConnectionError]
+        ):
+            response = views.view_all_users(request)
+
+        self.assertEqual(response.status_code, 503)
+        client_res.__exit__.assert_called_once()
+
+
+def create_log(target_id, action="DISPUTE_RESOLVED"):
+    return AdminActionLog.objects.create(
+        admin_id=1, action_type=action, target_type="payment", target_id=target_id
+    )
+
+
+def event_ids(chunks):
+    return [int(chunk.split("\n", 1)[0][4:]) for chunk in chunks]
+
+
+class EventBrokerTests(SimpleTestCase):
+    def event(self, id):
+        return {"id": id, "event": "admin_action", "data": {}}
+
+    def test_since_follows_publish_order_not_ids(self):
+        broker = events.EventBroker()
+        broker.publish(self.event(5))
+        cursor = broker.cursor()
+        broker.publish(self.event(3))
+        broker.publish(self.event(5))
+        self.assertEqual(broker.since(0), (2, [self.event(5), self.event(3)]))
+        self.assertEqual(broker.since(cursor), (2, [self.event(3)]))
+
+    def test_since_reports_dropped_history(self):
+        broker = events.EventBroker(history=2)
+        for id in (1, 2, 3):
+            broker.publish(self.event(id))
+        self.assertEqual(broker.since(0), (3, None))
+        self.assertEqual(broker.since(1), (3, [self.event(2), self.event(3)]))
+
+    def test_wait_times_out_empty(self):
+        self.assertEqual(events.EventBroker().wait(0, 0.01), (0, []))
+
+    def test_wait_async_wakes_on_publish_from_thread(self):
+        broker = events.EventBroker()
+
+        async def waiter():
+            timer = threading.Timer(0.05, broker.publish, [self.event(1)])
+            timer.start()
+            return await broker.wait_async(0, 5)
+
+        self.assertEqual(asyncio.run(waiter()), (1, [self.event(1)]))
+
+
+@override_settings(ADMIN_EVENT_STREAM_HEARTBEAT=0.01)
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.broker = events.EventBroker()
+        patches = [
+            mock.patch.object(events, "broker", self.broker),
+            mock.patch.object(events.poller, "start"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_resume_from_last_event_id(self):
+        logs = [create_log(n) for n in range(3)]
+        request = APIRequestFactory().get("/api/disputes/events/", HTTP_LAST_EVENT_ID=str(logs[0].id))
+        force_authenticate(request, user=SimpleNamespace(role="admin", is_authenticated=True))
+
+        response = views.dispute_events(request)
+        stream = iter(response.streaming_content)
+        chunks = [next(stream).decode() for _ in range(3)]
+        response.close()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(event_ids(chunks[:2]), [logs[1].id, logs[2].id])
+        self.assertIn("event: dispute.resolved", chunks[0])
+        self.assertEqual(chunks[2], ": ping\n\n")
+
+    def test_idle_heartbeat_does_not_query(self):
+        stream = events.stream_events(events.latest_log_id())
+        with self.assertNumQueries(1):
+            self.assertEqual(next(stream), ": ping\n\n")
+        with self.assertNumQueries(0):
+            self.assertEqual(next(stream), ": ping\n\n")
+        stream.close()
+        self.assertEqual(self.broker.subscribers, 0)
+
+    def test_live_event_already_replayed_is_skipped(self):
+        old = create_log(1)
+        stream = events.stream_events(0)
+        self.assertEqual(event_ids([next(stream)]), [old.id])
+
+        new = create_log(2)
+        events.publish_log(old)
+        events.publish_log(new, dispute={"id": 2})
+        chunk = next(stream)
+        stream.close()
+
+        self.assertEqual(event_ids([chunk]), [new.id])
+        self.assertIn('"dispute": {"id": 2}', chunk)
+
+    def test_poller_fills_rows_from_other_workers(self):
+        stream = events.stream_events(events.latest_log_id())
+        poller = events.LogPoller(self.broker)
+        poller.cursor = events.latest_log_id()
+        self.assertEqual(next(stream), ": ping\n\n")
+
+        # Written by another process: in the database, never published here.
+        remote = [create_log(n) for n in range(2)]
+        self.assertEqual(poller.poll(), 2)
+        chunks = [next(stream), next(stream)]
+        stream.close()
+
+        self.assertEqual(event_ids(chunks), [log.id for log in remote])
+        self.assertEqual(poller.cursor, remote[-1].id)
+
+    def test_poller_picks_up_rows_committed_out_of_id_order(self):
+        stream = events.stream_events(events.latest_log_id())
+        self.assertEqual(next(stream), ": ping\n\n")
+        late, early = create_log(1), create_log(2)
+        poller = events.LogPoller(self.broker)
+        # The poller already read ``early`` before ``late`` became visible.
+        poller.cursor = early.id
+        events.publish_log(early)
+        self.assertEqual(event_ids([next(stream)]), [early.id])
+
+        poller.poll()
+        self.assertEqual(event_ids([next(stream)]), [late.id])
+        poller.poll()
+        self.assertEqual(next(stream), ": ping\n\n")
+        stream.close()
+        self.assertEqual(poller.cursor, early.id)
+
+    def test_stream_falls_back_to_database_when_behind(self):
+        self.broker = events.EventBroker(history=1)
+        with mock.patch.object(events, "broker", self.broker):
+            stream = events.stream_events(events.latest_log_id())
+            self.assertEqual(next(stream), ": ping\n\n")
+            logs = [create_log(n) for n in range(3)]
+            for log in logs:
+                events.publish_log(log)
+            chunks = [next(stream) for _ in logs]
+            stream.close()
+
+        self.assertEqual(event_ids(chunks), [log.id for log in logs])
+
+    def test_async_log_publishes_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            log = async_to_sync(events.alog_admin_action)(1, "BLOCK_USER", "user", 3)
+        self.assertEqual(self.broker.cursor(), 0)
+
+        callbacks[0]()
+        self.assertEqual(self.broker.since(0)[1][0]["id"], log.id)
+
+
+CSV_FEED = (
+    "payment_id,application_id,raised_by,reason,status\n"
+    "1,10,5,late delivery,\n"
+    "2,20,5,wrong item,resolved\n"
+    "x,30,5,bad id,\n"
+    "1,10,6,repeat in feed,\n"
+    "3,30,5,,\n"
+    "4,40,5,existing,\n"
+)
+
+
+def import_rows(data, fmt, **kwargs):
+    return DisputeImport(1, **kwargs).run(iter_rows(decode_lines(BytesIO(data)), fmt))
+
+
+class IterRowsTests(SimpleTestCase):
+    def test_csv_rows_drop_empty_cells(self):
+        rows = list(iter_rows(decode_lines(BytesIO(b"\xef\xbb\xbf" + CSV_FEED.encode())), "csv"))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0], (1, {"payment_id": "1", "application_id": "10", "raised_by": "5",
+                                       "reason": "late delivery"}))
+        self.assertEqual(rows[4][1], {"payment_id": "3", "application_id": "30", "raised_by": "5"})
+
+    def test_ndjson_rows(self):
+        lines = ['{"payment_id": 1}\n', "\n", "not json\n", "[1, 2]\n", '{"payment_id": 2}']
+        self.assertEqual(
+            list(iter_rows(lines, "ndjson")),
+            [(1, {"payment_id": 1}), (2, None), (3, None), (4, {"payment_id": 2})]
+        )
+
+
+class DisputeImportTests(TestCase):
+    def setUp(self):
+        PaymentDispute.objects.create(payment_id=4, application_id=40, raised_by=1, reason="old")
+
+    def test_csv_import_report(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            report = import_rows(CSV_FEED.encode(), "csv", batch_size=2)
+
+        self.assertEqual(
+            {key: report[key] for key in ("processed", "created", "duplicates", "rejected_count", "batches")},
+            {"processed": 6, "created": 2, "duplicates": 2, "rejected_count": 2, "batches": 1}
+        )
+        self.assertIsNone(report["error"])
+        self.assertEqual([r["row"] for r in report["rejected"]], [3, 5])
+        self.assertIn("payment_id", report["rejected"][0]["errors"])
+        self.assertEqual(
+            set(PaymentDispute.objects.values_list("payment_id", "status")),
+            {(1, "open"), (2, "resolved"), (4, "open")}
+        )
+
+    def test_one_audit_entry_per_batch(self):
+        feed = "".join(
+            json.dumps({"payment_id": n, "application_id": n, "raised_by": 1, "reason": "r"}) + "\n"
+            for n in range(5)
+        )
+        report = import_rows(feed.encode(), "ndjson", batch_size=2)
+
+        self.assertEqual((report["created"], report["batches"]), (5, 3))
+        logs = AdminActionLog.objects.filter(action_type="PAYMENT_DISPUTES_IMPORTED").order_by("id")
+        self.assertEqual(
+            [log.description for log in logs],
+            ["Imported 2 disputes (batch 1)", "Imported 2 disputes (batch 2)",
+             "Imported 1 disputes (batch 3)"]
+        )
+
+    def test_duplicates_are_checked_inside_the_insert_transaction(self):
+        importer = DisputeImport(1)
+        row = {"payment_id": 7, "application_id": 7, "raised_by": 1, "reason": "r"}
+        valid = importer.validate([(1, row)])
+
+        def deduplicate(valid):
+            # Another import commits the same pair after validation.
+            PaymentDispute.objects.create(payment_id=7, application_id=7, raised_by=2, reason="other")
+            return DisputeImport.deduplicate(importer, valid)
+
+        with mock.patch.object(importer, "validate", return_value=valid), \
+                mock.patch.object(importer, "deduplicate", side_effect=deduplicate):
+            importer.process([(1, row)])
+
+        self.assertEqual((importer.created, importer.duplicates, importer.batches), (0, 1, 0))
+        self.assertEqual(PaymentDispute.objects.filter(payment_id=7).count(), 1)
+
+    def test_single_dispute_endpoint_allows_repeat_pair(self):
+        PaymentDispute.objects.create(
+            payment_id=4, application_id=40, raised_by=1, reason="first", status="rejected"
+        )
+        request = APIRequestFactory().post(
+            "/api/disputes/",
+            {"payment_id": 4, "application_id": 40, "raised_by": 1, "reason": "again",
+             "client_id": 1, "freelancer_id": 2},
+            format="json"
+        )
+        force_authenticate(request, user=SimpleNamespace(id=9, role="admin", is_authenticated=True))
+
+        response = views.payment_disputes(request)
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_bad_encoding_stops_with_partial_report(self):
+        feed = CSV_FEED.encode() + b"5,50,5,caf\xe9,\n"
+        report = import_rows(feed, "csv", batch_size=2)
+
+        self.assertIn("Unreadable input", report["error"])
+        self.assertEqual(report["created"], 2)
+
+    def test_malformed_csv_stops_with_partial_report(self):
+        feed = CSV_FEED + '5,50,5,"' + "x" * 200000 + '",\n'
+        report = import_rows(feed.encode(), "csv", batch_size=2)
+
+        self.assertIn("field larger than field limit", report["error"])
+        self.assertEqual(report["processed"], 6)
+
+    def test_import_endpoint(self):
+        upload = SimpleUploadedFile("feed.csv", CSV_FEED.encode(), content_type="text/csv")
+        request = APIRequestFactory().post("/api/disputes/import/", {"file": upload}, format="multipart")
+        force_authenticate(request, user=SimpleNamespace(id=9, role="admin", is_authenticated=True))
+
+        response = views.import_disputes(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(AdminActionLog.objects.get(action_type="PAYMENT_DISPUTES_IMPORTED").admin_id, 9)
+
+    def test_import_endpoint_rejects_unreadable_upload(self):
+        upload = SimpleUploadedFile("feed.csv", CSV_FEED.encode() + b"\xff\xfe\n")
+        request = APIRequestFactory().post("/api/disputes/import/", {"file": upload}, format="multipart")
+        force_authenticate(request, user=SimpleNamespace(id=9, role="admin", is_authenticated=True))
+
+        response = views.import_disputes(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 2)
+        self.assertIn("Unreadable input", response.data["error"])
+
+    def test_command_reports_unreadable_file_without_traceback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "feed.csv")
+            path.write_bytes(CSV_FEED.encode() + b"\xff\n")
+            stdout, stderr = StringIO(), StringIO()
+            with self.assertRaisesMessage(CommandError, "Import stopped: Unreadable input"):
+                call_command("import_disputes", str(path), stdout=stdout, stderr=stderr)
+
+        self.assertIn("2 created", stdout.getvalue())
+        self.assertIn("row 3:", stderr.getvalue())
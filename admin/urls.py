@@ -12,6 +12,8 @@ urlpatterns = [
     path('disputes/', views.payment_disputes, name='payment_disputes'),
     path('disputes/<int:dispute_id>/', views.get_dispute_details, name='get_dispute_details'),
     path('disputes/<int:dispute_id>/resolve/', views.resolve_dispute, name='resolve_dispute'),
+    path('disputes/import/', views.import_disputes, name='import_disputes'),
+    path('disputes/events/', views.dispute_events, name='dispute_events'),
 
     # Reviews
     path('reviews/<int:review_id>/delete/', views.delete_review, name='delete_review'),
@@ -1,14 +1,22 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.parsers import MultiPartParser
+from django.http import StreamingHttpResponse
+from django.conf import settings
 from django.utils import timezone
 from django.db.models import Q
+from contextlib import ExitStack
 import requests
 from .models import UserVerification, PaymentDispute, AdminActionLog
 from .serializers import UserVerificationSerializer, PaymentDisputeSerializer
 from .permissions import IsAdminUser
+from .imports import IMPORT_FORMATS, DisputeImport, decode_lines, guess_format, iter_rows
+from .events import latest_log_id, log_admin_action, log_data, resume_event_id, stream_events
+from .services import get_user_projection_params, read_user_page
 
 
 class AdminPagination(PageNumberPagination):
@@ -17,14 +25,13 @@ class AdminPagination(PageNumberPagination):
     max_page_size = 100
 
 
-def log_admin_action(admin_id, action, target_type, target_id, description=""):
-    AdminActionLog.objects.create(
-        admin_id=admin_id,
-        action_type=action,
-        target_type=target_type,
-        target_id=target_id,
-        description=description
-    )
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "event-stream"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only reached for error responses; the stream itself bypasses DRF.
+        return JSONRenderer().render(data)
 
 
 @api_view(["GET"])
@@ -33,59 +40,62 @@ def view_all_users(request):
     headers = {
         "Authorization": request.headers.get("Authorization")
     }
-    try:
-        client_res = requests.get(
-            "http://client-service/api/clients/",
-            headers=headers,
-            timeout=5
-        )
-        freelancer_res = requests.get(
-            "http://freelancer-service/api/freelancers/",
-            headers=headers,
-            timeout=5
-        )
-    except requests.exceptions.RequestException:
-        return Response(
-            {"error": "User services unavailable"},
-            status=status.HTTP_503_SERVICE_UNAVAILABLE
-        )
-
-    if client_res.status_code != 200 or freelancer_res.status_code != 200:
-        return Response(
-            {"error": "Failed to fetch users"},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
-
-    search_query = request.query_params.get('search', '')
-    clients = client_res.json()
-    freelancers = freelancer_res.json()
-
-    if isinstance(clients, list) and search_query:
-        clients = [u for u in clients if
-                   search_query.lower() in str(u).get('name', '').lower() or search_query.lower() in str(u).get('email',
-                                                                                                                '').lower()]
-    if isinstance(freelancers, list) and search_query:
-        freelancers = [u for u in freelancers if
-                       search_query.lower() in str(u).get('name', '').lower() or search_query.lower() in str(u).get(
-                           'email', '').lower()]
-
-    page = request.query_params.get('page', 1)
-    page_size = request.query_params.get('page_size', 20)
+    params = get_user_projection_params()
+    with ExitStack() as responses:
+        try:
+            client_res = responses.enter_context(requests.get(
+                f"{settings.CLIENT_SERVICE_URL}/api/clients/",
+                headers=headers,
+                params=params,
+                stream=True,
+                timeout=5
+            ))
+            freelancer_res = responses.enter_context(requests.get(
+                f"{settings.FREELANCER_SERVICE_URL}/api/freelancers/",
+                headers=headers,
+                params=params,
+                stream=True,
+                timeout=5
+            ))
+        except requests.exceptions.RequestException:
+            return Response(
+                {"error": "User services unavailable"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
-    try:
-        page = int(page)
-        page_size = int(page_size)
-    except (ValueError, TypeError):
-        page = 1
-        page_size = 20
+        if client_res.status_code != 200 or freelancer_res.status_code != 200:
+            return Response(
+                {"error": "Failed to fetch users"},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
 
-    start = (page - 1) * page_size
-    end = start + page_size
+        search_query = request.query_params.get('search', '')
+        page = request.query_params.get('page', 1)
+        page_size = request.query_params.get('page_size', 20)
+
+        try:
+            page = int(page)
+            page_size = int(page_size)
+        except (ValueError, TypeError):
+            page = 1
+            page_size = 20
+
+        start = (page - 1) * page_size
+        end = start + page_size
+
+        try:
+            clients = read_user_page(client_res, search_query, start, end)
+            freelancers = read_user_page(freelancer_res, search_query, start, end)
+        except (ValueError, requests.exceptions.RequestException):
+            return Response(
+                {"error": "Failed to fetch users"},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
 
     return Response(
         {
-            "clients": clients[start:end] if isinstance(clients, list) else clients,
-            "freelancers": freelancers[start:end] if isinstance(freelancers, list) else freelancers,
+            "clients": clients,
+            "freelancers": freelancers,
             "page": page,
             "page_size": page_size
         },
@@ -106,9 +116,9 @@ def block_user(request, role, user_id):
         "Authorization": request.headers.get("Authorization")
     }
     service_url = (
-        f"http://client-service/api/clients/{user_id}/block/"
+        f"{settings.CLIENT_SERVICE_URL}/api/clients/{user_id}/block/"
         if role == "client"
-        else f"http://freelancer-service/api/freelancers/{user_id}/block/"
+        else f"{settings.FREELANCER_SERVICE_URL}/api/freelancers/{user_id}/block/"
     )
 
     try:
@@ -145,9 +155,9 @@ def unblock_user(request, role, user_id):
         "Authorization": request.headers.get("Authorization")
     }
     service_url = (
-        f"http://client-service/api/clients/{user_id}/unblock/"
+        f"{settings.CLIENT_SERVICE_URL}/api/clients/{user_id}/unblock/"
         if role == "client"
-        else f"http://freelancer-service/api/freelancers/{user_id}/unblock/"
+        else f"{settings.FREELANCER_SERVICE_URL}/api/freelancers/{user_id}/unblock/"
     )
 
     try:
@@ -241,13 +251,40 @@ def payment_disputes(request):
             "PAYMENT_DISPUTE_CREATED",
             "payment",
             dispute.payment_id,
-            f"Reason: {dispute.reason}"
+            f"Reason: {dispute.reason}",
+            dispute=serializer.data
         )
         return Response(serializer.data, status=201)
 
     return Response(serializer.errors, status=400)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsAdminUser])
+@parser_classes([MultiPartParser])
+def import_disputes(request):
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response(
+            {"error": "file is required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    fmt = request.data.get("format") or guess_format(upload.name)
+    if fmt not in IMPORT_FORMATS:
+        return Response(
+            {"error": f"format must be one of: {', '.join(IMPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    report = DisputeImport(request.user.id, max_rejected=100).run(
+        iter_rows(decode_lines(upload), fmt)
+    )
+    if report["error"]:
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report, status=200)
+
+
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def resolve_dispute(request, dispute_id):
@@ -272,15 +309,16 @@ def resolve_dispute(request, dispute_id):
     dispute.resolved_by = request.user.id
     dispute.save()
 
+    serializer = PaymentDisputeSerializer(dispute)
     log_admin_action(
         request.user.id,
         "DISPUTE_RESOLVED",
         "payment",
         dispute.payment_id,
-        f"Resolution: {resolution}"
+        f"Resolution: {resolution}",
+        dispute=serializer.data
     )
 
-    serializer = PaymentDisputeSerializer(dispute)
     return Response(serializer.data, status=200)
 
 
@@ -292,7 +330,7 @@ def delete_review(request, review_id):
     }
     try:
         response = requests.delete(
-            f"http://review-service/api/reviews/delete/{review_id}",
+            f"{settings.REVIEW_SERVICE_URL}/api/reviews/delete/{review_id}",
             headers=headers,
             timeout=5
         )
@@ -338,7 +376,7 @@ def send_notification(request):
     }
     try:
         response = requests.post(
-            "http://notification-service/api/notifications/send/",
+            f"{settings.NOTIFICATION_SERVICE_URL}/api/notifications/send/",
             json=payload,
             headers=headers,
             timeout=5
@@ -370,7 +408,7 @@ def view_all_notifications(request):
     }
     try:
         response = requests.get(
-            "http://notification-service/api/notifications/view",
+            f"{settings.NOTIFICATION_SERVICE_URL}/api/notifications/view",
             headers=headers,
             timeout=5
         )
@@ -409,18 +447,7 @@ def admin_logs(request):
     paginator = AdminPagination()
     paginated_logs = paginator.paginate_queryset(logs, request)
 
-    data = [
-        {
-            "id": log.id,
-            "admin_id": log.admin_id,
-            "action": log.action_type,
-            "target": log.target_type,
-            "target_id": log.target_id,
-            "description": log.description,
-            "time": log.created_at
-        }
-        for log in paginated_logs
-    ]
+    data = [log_data(log) for log in paginated_logs]
     return paginator.get_paginated_response(data)
 
 
@@ -436,4 +463,24 @@ def get_dispute_details(request, dispute_id):
         )
 
     serializer = PaymentDisputeSerializer(dispute)
-    return Response(serializer.data, status=200)
\ No newline at end of file
+    return Response(serializer.data, status=200)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminUser])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def dispute_events(request):
+    try:
+        last_id = resume_event_id(request)
+    except ValueError:
+        return Response(
+            {"error": "last_id must be an integer"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if last_id is None:
+        last_id = latest_log_id()
+
+    response = StreamingHttpResponse(stream_events(last_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
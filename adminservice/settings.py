@@ -58,6 +58,26 @@ ROOT_URLCONF = "adminservice.urls"
 WSGI_APPLICATION = "adminservice.wsgi.application"
 
 
+# --------------------
+# TEMPLATES
+# --------------------
+# Needed by django.contrib.admin (admin/ route).
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+
 # --------------------
 # DATABASE
 # --------------------
@@ -111,3 +131,41 @@ SIMPLE_JWT = {
     "ALGORITHM": os.getenv("JWT_ALGORITHM", "HS256"),
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
 }
+
+
+# --------------------
+# UPSTREAM SERVICES
+# --------------------
+CLIENT_SERVICE_URL = os.getenv("CLIENT_SERVICE_URL", "http://client-service")
+FREELANCER_SERVICE_URL = os.getenv("FREELANCER_SERVICE_URL", "http://freelancer-service")
+REVIEW_SERVICE_URL = os.getenv("REVIEW_SERVICE_URL", "http://review-service")
+NOTIFICATION_SERVICE_URL = os.getenv("NOTIFICATION_SERVICE_URL", "http://notification-service")
+
+# Connection pool of the async upstream client (ASGI profile), per worker.
+# Calls beyond UPSTREAM_MAX_CONNECTIONS wait up to UPSTREAM_POOL_TIMEOUT
+# seconds for a free connection; UPSTREAM_TIMEOUT covers connect/read/write.
+# httpcore checks every idle connection on each request, so a large
+# keep-alive pool costs more CPU than reconnecting.
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "5"))
+UPSTREAM_POOL_TIMEOUT = float(os.getenv("UPSTREAM_POOL_TIMEOUT", "30"))
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "500"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+
+# --------------------
+# PROXIED USER DATA
+# --------------------
+# Only these fields are kept from client/freelancer records in view_all_users.
+ADMIN_USER_FIELDS = tuple(
+    f.strip() for f in os.getenv("ADMIN_USER_FIELDS", "id,name,email,status").split(",") if f.strip()
+)
+# Query param used to ask upstream services for the projection ("" disables it).
+ADMIN_USER_FIELDS_PARAM = os.getenv("ADMIN_USER_FIELDS_PARAM", "fields")
+
+
+# --------------------
+# EVENT STREAM
+# --------------------
+# Seconds between keep-alive pings on /api/disputes/events/, and between
+# audit log polls for events written by other workers.
+ADMIN_EVENT_STREAM_HEARTBEAT = int(os.getenv("ADMIN_EVENT_STREAM_HEARTBEAT", "15"))
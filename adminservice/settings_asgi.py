@@ -0,0 +1,19 @@
+"""
+ASGI deployment profile.
+
+Serves the upstream-proxy endpoints with native async views (httpx + async
+ORM) so one worker can keep many slow upstream calls in flight. Run with:
+
+    gunicorn adminservice.asgi:application -c gunicorn_asgi.conf.py
+
+It extends ``adminservice.settings`` unless ``ASGI_BASE_SETTINGS`` names
+another profile, e.g. ``adminservice.settings_lean`` for lean + ASGI.
+"""
+import os
+from importlib import import_module
+
+_base = import_module(os.getenv("ASGI_BASE_SETTINGS", "adminservice.settings"))
+globals().update({name: value for name, value in vars(_base).items() if name.isupper()})
+
+ROOT_URLCONF = "adminservice.urls_asgi"
+ASGI_APPLICATION = "adminservice.asgi.application"
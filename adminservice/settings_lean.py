@@ -0,0 +1,54 @@
+"""
+Lean production profile for the stateless JWT API.
+
+Drops everything the API never uses: the Django admin site, sessions,
+messages, static files, CSRF/clickjacking middleware, translations and the
+browsable API. Run with:
+
+    DJANGO_SETTINGS_MODULE=adminservice.settings_lean gunicorn adminservice.wsgi:application
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK
+
+DEBUG = os.getenv("DEBUG", "False") == "True"
+
+
+# --------------------
+# APPS
+# --------------------
+# auth + contenttypes stay: JWTAuthentication loads the user model.
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+
+    "rest_framework",
+    "corsheaders",
+
+    "admin",
+]
+
+
+# --------------------
+# MIDDLEWARE
+# --------------------
+# No session/CSRF/auth/messages/clickjacking middleware: DRF authenticates
+# every request from the JWT and the API serves no HTML.
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+
+ROOT_URLCONF = "adminservice.urls_lean"
+
+USE_I18N = False
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": (
+        "rest_framework.renderers.JSONRenderer",
+    ),
+}
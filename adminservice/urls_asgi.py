@@ -0,0 +1,19 @@
+"""
+URL configuration for the ASGI profile.
+
+Identical to ``adminservice.urls`` except that ``api/`` routes the
+upstream-proxy endpoints to the async views in ``admin.async_views``.
+The ``admin/`` site is only routed when its app is installed (not on the
+lean base profile).
+"""
+from django.apps import apps
+from django.urls import path,include
+
+urlpatterns = [
+    path("api/",include("admin.async_urls")),
+]
+
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
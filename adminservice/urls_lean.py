@@ -0,0 +1,10 @@
+"""
+URL configuration for the lean profile (``adminservice.settings_lean``).
+
+Same API routes as ``adminservice.urls`` without the Django admin site.
+"""
+from django.urls import path,include
+
+urlpatterns = [
+    path("api/",include("admin.urls")),
+]
@@ -0,0 +1,20 @@
+"""
+Settings for benchmarks/upstream_concurrency.py. Not for deployment.
+
+Loads the profile named by ``BENCH_SETTINGS`` (default
+``adminservice.settings``) and swaps in simplejwt's stateless
+authentication, so a token with a ``role: admin`` claim (see the ``token``
+subcommand) reaches the proxy views without a user table.
+"""
+import os
+from importlib import import_module
+
+_base = import_module(os.getenv("BENCH_SETTINGS", "adminservice.settings"))
+globals().update({name: value for name, value in vars(_base).items() if name.isupper()})
+
+REST_FRAMEWORK = {
+    **_base.REST_FRAMEWORK,
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication",
+    ),
+}
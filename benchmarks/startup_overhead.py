@@ -0,0 +1,158 @@
+"""
+Startup and per-request overhead of the Django settings profiles.
+
+Each profile is measured in fresh interpreter processes:
+
+  cold start   process spawn until the WSGI app has served its first
+               request (interpreter, settings, app registry, URLconf,
+               middleware)
+  RSS          resident memory of the worker after the first request
+  request      mean time of an unauthenticated ``GET /api/logs/`` through
+               the full middleware chain and DRF (401, no database access)
+
+Usage:
+
+  python benchmarks/startup_overhead.py \\
+      adminservice.settings adminservice.settings_lean --runs 5 --requests 2000
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def call(app, path):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    result = app(environ, lambda status, headers, exc_info=None: None)
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+
+
+def child(settings_module, requests, spawned):
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    from django.core.wsgi import get_wsgi_application
+
+    app = get_wsgi_application()
+    call(app, "/api/logs/")
+    cold_start = time.time() - spawned
+    rss = rss_kb()
+
+    import logging
+    logging.disable(logging.WARNING)  # skip "Unauthorized" log lines
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        call(app, "/api/logs/")
+    per_request = (time.perf_counter() - started) / requests
+
+    from django.conf import settings
+    print(json.dumps({
+        "cold_start": cold_start,
+        "rss_kb": rss,
+        "request": per_request,
+        "apps": len(settings.INSTALLED_APPS),
+        "middleware": len(settings.MIDDLEWARE),
+        "modules": len(sys.modules),
+    }))
+
+
+def sample(settings_module, requests):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", settings_module,
+         "--requests", str(requests), "--spawned", repr(time.time())],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if out.returncode != 0:
+        error = out.stderr.strip().splitlines()
+        raise RuntimeError(f"{settings_module}: {error[-1] if error else 'failed'}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(profiles, runs, requests):
+    # Profiles take turns within each run, so drift on a busy machine hits
+    # all of them alike.
+    samples = {profile: [] for profile in profiles}
+    failed = {}
+    for _ in range(runs):
+        for profile in profiles:
+            if profile in failed:
+                continue
+            try:
+                samples[profile].append(sample(profile, requests))
+            except RuntimeError as exc:
+                failed[profile] = exc
+    results = {}
+    for profile in profiles:
+        if profile in failed:
+            results[profile] = failed[profile]
+        else:
+            results[profile] = {
+                key: statistics.median(s[key] for s in samples[profile]) for key in samples[profile][0]
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup and per-request overhead per settings profile.")
+    parser.add_argument("profiles", nargs="*", default=["adminservice.settings", "adminservice.settings_lean"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--spawned", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BASE_DIR))
+    if args.child:
+        child(args.child, args.requests, args.spawned)
+        return
+
+    print(f"{'profile':<32} {'apps':>4} {'mw':>3} {'modules':>7} {'cold start':>10} "
+          f"{'RSS':>9} {'request':>9}")
+    for profile, r in measure(args.profiles, args.runs, args.requests).items():
+        if isinstance(r, RuntimeError):
+            print(f"{profile:<32} failed: {r}")
+            continue
+        print(f"{profile:<32} {r['apps']:>4.0f} {r['middleware']:>3.0f} {r['modules']:>7.0f} "
+              f"{r['cold_start'] * 1000:>8.0f}ms {r['rss_kb'] / 1024:>7.1f}MB {r['request'] * 1e6:>7.0f}us")
+
+
+if __name__ == "__main__":
+    main()
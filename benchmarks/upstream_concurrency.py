@@ -0,0 +1,204 @@
+"""
+Concurrency benchmark for the upstream-proxy endpoints (WSGI vs ASGI).
+
+Subcommands:
+
+  upstream   Fake client/freelancer/review/notification service that answers
+             every request after ``--delay`` seconds.
+  load       Fires ``--requests`` calls at the admin service with at most
+             ``--concurrency`` in flight and reports throughput and latency.
+  token      Prints an admin access token for ``benchmarks.bench_settings``.
+
+``upstream`` and ``load`` use the standard library only.
+
+Example (single worker each, upstream delay 500 ms):
+
+  python benchmarks/upstream_concurrency.py upstream --port 9000 --delay 0.5
+
+  export CLIENT_SERVICE_URL=http://127.0.0.1:9000 \\
+         FREELANCER_SERVICE_URL=http://127.0.0.1:9000 \\
+         REVIEW_SERVICE_URL=http://127.0.0.1:9000 \\
+         NOTIFICATION_SERVICE_URL=http://127.0.0.1:9000
+
+  # WSGI build
+  gunicorn adminservice.wsgi:application -w 1 --threads 8 -b 127.0.0.1:8000 \\
+      --env DJANGO_SETTINGS_MODULE=benchmarks.bench_settings
+  # ASGI build
+  GUNICORN_WORKERS=1 GUNICORN_BIND=127.0.0.1:8000 \\
+      gunicorn adminservice.asgi:application -c gunicorn_asgi.conf.py \\
+      --env DJANGO_SETTINGS_MODULE=benchmarks.bench_settings \\
+      --env BENCH_SETTINGS=adminservice.settings_asgi
+
+  python benchmarks/upstream_concurrency.py load \\
+      --url http://127.0.0.1:8000/api/notifications/ \\
+      --token "$(python benchmarks/upstream_concurrency.py token)" \\
+      --concurrency 200 --requests 2000
+
+With a 0.5 s upstream the WSGI worker is capped at threads / delay
+(8 / 0.5 = 16 req/s); the ASGI worker keeps all ``--concurrency`` calls in
+flight and scales until CPU-bound.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+async def handle_upstream(reader, writer, delay):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode().split(" ", 2)
+            length = 0
+            keep_alive = True
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                name, value = name.strip().lower(), value.strip().lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "connection" and value == "close":
+                    keep_alive = False
+            if length:
+                await reader.readexactly(length)
+
+            await asyncio.sleep(delay)
+
+            if method == "GET" and "/notifications/" not in path:
+                body = json.dumps([
+                    {"id": i, "name": f"user{i}", "email": f"user{i}@example.com",
+                     "status": "active", "bio": "x" * 200}
+                    for i in range(50)
+                ])
+                code = "200 OK"
+            elif method == "POST":
+                body, code = json.dumps({"id": 1}), "201 Created"
+            else:
+                body, code = json.dumps({"status": "ok"}), "200 OK"
+
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {code}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_upstream(args):
+    server = await asyncio.start_server(
+        lambda r, w: handle_upstream(r, w, args.delay), args.host, args.port
+    )
+    print(f"Slow upstream on {args.host}:{args.port} (delay {args.delay}s)")
+    async with server:
+        await server.serve_forever()
+
+
+async def one_request(url, method, token, body):
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    headers = [
+        f"{method} {path} HTTP/1.1",
+        f"Host: {parts.netloc}",
+        f"Authorization: Bearer {token}",
+        "Connection: close",
+    ]
+    if body:
+        headers += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+async def run_load(args):
+    body = args.body.encode() if args.body else b""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    codes = {}
+
+    async def worker():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                code = await asyncio.wait_for(
+                    one_request(args.url, args.method, args.token, body), args.timeout
+                )
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                code = "error"
+            latencies.append(time.perf_counter() - started)
+            codes[code] = codes.get(code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"requests     {args.requests} (concurrency {args.concurrency})")
+    print(f"elapsed      {elapsed:.2f}s")
+    print(f"throughput   {args.requests / elapsed:.1f} req/s")
+    print(f"latency p50  {statistics.median(latencies) * 1000:.0f} ms")
+    print(f"latency p99  {latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f} ms")
+    print(f"status codes {codes}")
+
+
+def print_token(args):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.bench_settings")
+    import django
+    django.setup()
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    token = AccessToken()
+    token["user_id"] = args.user_id
+    token["role"] = "admin"
+    print(token)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    upstream = sub.add_parser("upstream")
+    upstream.add_argument("--host", default="127.0.0.1")
+    upstream.add_argument("--port", type=int, default=9000)
+    upstream.add_argument("--delay", type=float, default=0.5)
+
+    load = sub.add_parser("load")
+    load.add_argument("--url", required=True)
+    load.add_argument("--token", default="")
+    load.add_argument("--method", default="GET")
+    load.add_argument("--body", default="")
+    load.add_argument("--concurrency", type=int, default=200)
+    load.add_argument("--requests", type=int, default=2000)
+    load.add_argument("--timeout", type=float, default=60)
+
+    token = sub.add_parser("token")
+    token.add_argument("--user-id", type=int, default=1)
+
+    args = parser.parse_args()
+    if args.command == "token":
+        print_token(args)
+        return
+    asyncio.run(run_upstream(args) if args.command == "upstream" else run_load(args))
+
+
+if __name__ == "__main__":
+    main()
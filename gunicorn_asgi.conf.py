@@ -0,0 +1,18 @@
+# Gunicorn profile for the async (ASGI) build of the admin service.
+#
+#   pip install gunicorn uvicorn httpx
+#   gunicorn adminservice.asgi:application -c gunicorn_asgi.conf.py
+#
+# Each uvicorn worker runs one event loop, so concurrency per worker is bound
+# by open sockets rather than threads. Keep workers ~= CPU cores.
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 5
+timeout = 30
+graceful_timeout = 30
+
+raw_env = ["DJANGO_SETTINGS_MODULE=adminservice.settings_asgi"]